@@ -1,14 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, Label, messagebox, Frame, Entry, StringVar
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, ImageDraw, ImageFont
 import serial
 import cv2
-from picamera2 import Picamera2
+import numpy as np
+from picamera2 import Picamera2, MappedArray
 import threading
 import logging
 import time
-from ultralytics import YOLO
+from collections import deque
+import ncnn
+import yaml
 import os
+import re
+import struct
+import termios
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,17 +28,58 @@ ALERT_COLOR = "#FFEB3B"
 FONT_MAIN = ("Helvetica", 12)
 FONT_TITLE = ("Helvetica", 16, "bold")
 FONT_WARNING = ("Helvetica", 20, "bold")
+FONT_HUD = ("Helvetica", 18, "bold")
+GUI_INTERVAL = 0.033
+YOLO_MODEL_DIR = "nano_ncnn_int8_model"
+YOLO_INPUT_SIZE = 320
+YOLO_CONF_THRESHOLD = 0.25
+YOLO_IOU_THRESHOLD = 0.7
+YOLO_LATENCY_BUDGET = 0.066
+YOLO_CPUS = {0, 1}
+CAMERA_CPUS = {2}
+LIDAR_CPUS = {3}
+REALTIME_PRIORITY = 20
+LIDAR_RECONNECT_DELAY = 1.0
+INTEGER_PATTERN = re.compile(r"\s*-?\d+\s*", re.ASCII)
+
+def load_font(size):
+    try:
+        return ImageFont.truetype("Arial", size)
+    except IOError:
+        return ImageFont.load_default()
+
+def set_thread_scheduling(cpus=None, realtime_priority=None):
+    try:
+        if cpus is not None:
+            os.sched_setaffinity(0, cpus)
+        if realtime_priority is not None:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(realtime_priority))
+    except (AttributeError, OSError) as e:
+        logger.warning(f"Could not set thread scheduling: {e}")
 
 class LidarSensor:
+    FRAME = struct.Struct("<2xH5x")
+    COMPACT_THRESHOLD = 4096
+
     def __init__(self, port="/dev/ttyUSB0", baudrate=115200):
         self.port = port
         self.baudrate = baudrate
         self.serial = None
+        self._fd = None
         self.buffer = bytearray()
+        self._head = 0
 
     def connect(self):
         try:
             self.serial = serial.Serial(self.port, baudrate=self.baudrate, timeout=1)
+            self._fd = self.serial.fileno()
+            self.buffer.clear()
+            self._head = 0
+            os.set_blocking(self._fd, True)
+            attrs = termios.tcgetattr(self._fd)
+            attrs[6][termios.VMIN] = 1
+            attrs[6][termios.VTIME] = 0
+            termios.tcsetattr(self._fd, termios.TCSANOW, attrs)
             logger.info(f"Connected to LIDAR on {self.port}")
             return True
         except Exception as e:
@@ -43,27 +90,42 @@ class LidarSensor:
         if self.serial and self.serial.is_open:
             self.serial.close()
             logger.info("Disconnected from LIDAR")
+        self._fd = None
+
+    def is_connected(self):
+        return self.serial is not None and self.serial.is_open
 
     def read_available(self):
-        if not self.serial or not self.serial.is_open:
+        if not self.is_connected():
             logger.warning("LIDAR serial port is not open")
             return []
         try:
-            data = self.serial.read(self.serial.in_waiting or 1)
-            if data:
-                self.buffer.extend(data)
-                distances = []
-                while len(self.buffer) >= 9:
-                    if self.buffer[0] == 0x59 and self.buffer[1] == 0x59:
-                        distance = self.buffer[2] + self.buffer[3] * 256
-                        distances.append(distance)
-                        self.buffer = self.buffer[9:]
-                    else:
-                        self.buffer = self.buffer[1:]
-                return distances
-        except Exception as e:
-            logger.error(f"Error reading LIDAR data: {e}")
-        return []
+            data = os.read(self._fd, 4096)
+        except OSError as e:
+            logger.error(f"LIDAR read failed, disconnecting: {e}")
+            self.disconnect()
+            return []
+        if not data:
+            logger.error("LIDAR device closed, disconnecting")
+            self.disconnect()
+            return []
+        
+        self.buffer.extend(data)
+        buffer = self.buffer
+        head = self._head
+        end = len(buffer) - self.FRAME.size
+        distances = []
+        while head <= end:
+            if buffer[head] == 0x59 and buffer[head + 1] == 0x59:
+                distances.append(self.FRAME.unpack_from(buffer, head)[0])
+                head += self.FRAME.size
+            else:
+                head += 1
+        if head > self.COMPACT_THRESHOLD:
+            del buffer[:head]
+            head = 0
+        self._head = head
+        return distances
 
 class CameraApp:
     def __init__(self, root):
@@ -81,7 +143,7 @@ class CameraApp:
         self.style.configure('TLabel',  background=DARK_BG, foreground=TEXT_COLOR,font=FONT_MAIN)
         
         self.camera = Picamera2()
-        config = self.camera.create_video_configuration(main={"size": (640, 480)})
+        config = self.camera.create_video_configuration(main={"size": (640, 480), "format": "BGR888"})
         self.camera.configure(config)
         self.lidar = LidarSensor()
         if not self.lidar.connect():
@@ -89,18 +151,49 @@ class CameraApp:
             self.root.destroy()
             return
 
-        self.model = YOLO("nano_ncnn_model", task='segment')
-        self.latest_frame = None
+        self._ncnn = ncnn.Net()
+        self._ncnn.opt.num_threads = len(YOLO_CPUS)
+        self._ncnn.load_param(os.path.join(YOLO_MODEL_DIR, "model.ncnn.param"))
+        self._ncnn.load_model(os.path.join(YOLO_MODEL_DIR, "model.ncnn.bin"))
+        with open(os.path.join(YOLO_MODEL_DIR, "metadata.yaml")) as f:
+            self._names = yaml.safe_load(f)["names"]
+        self._frames = [np.empty((480, 640, 3), dtype=np.uint8) for _ in range(2)]
+        self._write_idx = 0
+        self._frame_seq = 0
+        self._last_drawn_seq = -1
+        self._last_distance = None
+        self._next_deadline = 0.0
+        self._drop_frame = False
+        self._rgb_buf = np.empty((480, 640, 3), dtype=np.uint8)
+        self._infer_frames = [np.empty((480, 640, 3), dtype=np.uint8) for _ in range(2)]
+        self._infer_idx = 0
+        self._ppm_header = b"P6\n640 480\n255\n"
+        self._infer_pending = False
+        self.infer_out = None
+        self._infer_generation = 0
+        self._infer_event = threading.Event()
+        self._infer_times = deque(maxlen=100)
         self.latest_distance = 0
         self.running = False
         self.lock = threading.Lock()
         
         self.min_distance_var = StringVar(value="50")
         self.max_distance_var = StringVar(value="200")
+        self._min_valid = True
+        self._max_valid = True
+        self.min_distance_var.trace_add("write", self._validate_min)
+        self.max_distance_var.trace_add("write", self._validate_max)
         
         self.min_distance = 50
         self.max_distance = 200
         self.warning_text = ""
+        self._flashing = False
+        self._flash_job = None
+        
+        self._font18 = load_font(18)
+        self._font24 = load_font(24)
+        self._font30 = load_font(30)
+        self.build_out_of_range_templates()
         
         self.main_frame = Frame(root, bg=DARK_BG)
         self.main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -141,6 +234,9 @@ class CameraApp:
         self.live_image_label = Label(self.live_container, bg=DARK_BG, bd=1, relief=tk.SUNKEN)
         self.live_image_label.pack(fill=tk.BOTH, expand=True)
         
+        self.distance_overlay_label = Label(self.live_image_label, text="", font=FONT_HUD, fg=TEXT_COLOR, bg="black", padx=5, pady=5)
+        self.distance_overlay_label.place(relx=0.5, rely=0.5, x=310, y=-230, anchor="ne")
+        
         self.filtered_container = Frame(self.video_frame, bg=LIGHT_BG, padx=10, pady=10, bd=2, relief=tk.GROOVE)
         self.filtered_container.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(10, 0))
         
@@ -181,28 +277,39 @@ class CameraApp:
         
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    def _validate_min(self, *args):
+        self._min_valid = INTEGER_PATTERN.fullmatch(self.min_distance_var.get()) is not None
+
+    def _validate_max(self, *args):
+        self._max_valid = INTEGER_PATTERN.fullmatch(self.max_distance_var.get()) is not None
+
     def apply_settings(self):
-        try:
-            min_val = int(self.min_distance_var.get())
-            max_val = int(self.max_distance_var.get())
-            
-            if min_val < 0 or max_val < 0:
-                messagebox.showerror("Hata", "Mesafe değerleri negatif olamaz")
-                return
-                
-            if min_val >= max_val:
-                messagebox.showerror("Hata", "Minimum mesafe maksimumdan küçük olmalı")
-                return
-                
-            self.min_distance = min_val
-            self.max_distance = max_val
-            
-            self.range_status_label.config(text=f"Tespit aralığı: {self.min_distance}-{self.max_distance} cm")
+        if not (self._min_valid and self._max_valid):
+            messagebox.showerror("Hata", "Mesafe değerleri sayı olmalı")
+            return
+        
+        min_val = int(self.min_distance_var.get())
+        max_val = int(self.max_distance_var.get())
+        
+        if (min_val, max_val) == (self.min_distance, self.max_distance):
+            return
+        
+        if min_val < 0 or max_val < 0:
+            messagebox.showerror("Hata", "Mesafe değerleri negatif olamaz")
+            return
             
-            self.show_temp_message("Ayarlar başarıyla güncellendi")
+        if min_val >= max_val:
+            messagebox.showerror("Hata", "Minimum mesafe maksimumdan küçük olmalı")
+            return
             
-        except ValueError:
-            messagebox.showerror("Hata", "Mesafe değerleri sayı olmalı")
+        self.min_distance = min_val
+        self.max_distance = max_val
+        
+        self.range_status_label.config(text=f"Tespit aralığı: {self.min_distance}-{self.max_distance} cm")
+        self.build_out_of_range_templates()
+        self._last_distance = None
+        
+        self.show_temp_message("Ayarlar başarıyla güncellendi")
 
     def show_temp_message(self, message):
         prev_text = self.warning_text
@@ -219,24 +326,19 @@ class CameraApp:
         placeholder = Image.new('RGB', (640, 480), color='black')
         placeholder_text = "Kamera başlatılıyor..."
         
-        from PIL import ImageDraw, ImageFont
         draw = ImageDraw.Draw(placeholder)
-        try:
-            font = ImageFont.truetype("Arial", 30)
-        except IOError:
-            font = ImageFont.load_default()
+        font = self._font30
             
         textwidth, textheight = draw.textbbox((0, 0), placeholder_text, font=font)[2:]
         position = ((640 - textwidth) // 2, (480 - textheight) // 2)
         
         draw.text(position, placeholder_text, fill=(0, 255, 0), font=font)
         
-        placeholder_img = ImageTk.PhotoImage(placeholder)
+        self._live_photo = tk.PhotoImage(data=self._ppm_header + placeholder.tobytes(), format="PPM")
+        self._filt_photo = ImageTk.PhotoImage(placeholder)
         
-        self.live_image_label.config(image=placeholder_img)
-        self.live_image_label.image = placeholder_img
-        self.filtered_image_label.config(image=placeholder_img)
-        self.filtered_image_label.image = placeholder_img
+        self.live_image_label.config(image=self._live_photo)
+        self.filtered_image_label.config(image=self._filt_photo)
 
     def start(self):
         if not self.running:
@@ -246,129 +348,192 @@ class CameraApp:
             self.camera.start()
             threading.Thread(target=self.camera_loop, daemon=True).start()
             threading.Thread(target=self.lidar_loop, daemon=True).start()
+            threading.Thread(target=self._yolo_worker, daemon=True).start()
+            set_thread_scheduling(realtime_priority=REALTIME_PRIORITY)
+            self._next_deadline = time.monotonic()
             self.update_gui()
 
     def camera_loop(self):
+        set_thread_scheduling(CAMERA_CPUS)
         while self.running:
-            frame = self.camera.capture_array()
+            request = self.camera.capture_request()
+            try:
+                with MappedArray(request, "main") as m:
+                    np.copyto(self._frames[1 - self._write_idx], m.array[..., :3])
+            finally:
+                request.release()
             with self.lock:
-                self.latest_frame = frame.copy()
+                self._write_idx ^= 1
+                self._frame_seq += 1
 
     def lidar_loop(self):
+        set_thread_scheduling(LIDAR_CPUS, REALTIME_PRIORITY)
         while self.running:
+            if not self.lidar.is_connected():
+                time.sleep(LIDAR_RECONNECT_DELAY)
+                if self.running:
+                    self.lidar.connect()
+                continue
             distances = self.lidar.read_available()
             if distances:
                 with self.lock:
                     self.latest_distance = distances[-1]
-            time.sleep(0.01)
+
+    def _yolo_worker(self):
+        set_thread_scheduling(YOLO_CPUS)
+        while self.running:
+            if not self._infer_event.wait(timeout=0.5):
+                continue
+            with self.lock:
+                pending = self._infer_pending
+                self._infer_pending = False
+                self._infer_event.clear()
+                if pending:
+                    generation = self._infer_generation
+                    inferred = self._infer_frames[self._infer_idx]
+                    np.copyto(inferred, self._frames[self._write_idx])
+            if not pending:
+                continue
+            try:
+                mat = ncnn.Mat.from_pixels_resize(inferred, ncnn.Mat.PixelType.PIXEL_RGB, 640, 480, YOLO_INPUT_SIZE, YOLO_INPUT_SIZE)
+                started = time.perf_counter()
+                result = self.run_yolo(mat)
+                self.record_infer_time(time.perf_counter() - started)
+            except Exception as e:
+                logger.error(f"Error processing image: {e}")
+                continue
+            with self.lock:
+                if generation != self._infer_generation:
+                    continue
+                self.infer_out = (result, inferred)
+                self._infer_idx ^= 1
+
+    def record_infer_time(self, elapsed):
+        self._infer_times.append(elapsed)
+        if len(self._infer_times) < self._infer_times.maxlen:
+            return
+        p99 = sorted(self._infer_times)[int(len(self._infer_times) * 0.99) - 1]
+        if p99 > YOLO_LATENCY_BUDGET:
+            logger.warning(f"YOLO p99 latency {p99 * 1000:.1f} ms exceeds {YOLO_LATENCY_BUDGET * 1000:.0f} ms budget")
+        else:
+            logger.info(f"YOLO p99 latency {p99 * 1000:.1f} ms")
+        self._infer_times.clear()
 
     def update_gui(self):
         if not self.running:
             return
 
+        if self._drop_frame:
+            self._drop_frame = False
+            self.schedule_next_gui_update()
+            return
+
         with self.lock:
-            frame = self.latest_frame.copy() if self.latest_frame is not None else None
+            seq = self._frame_seq
+            frame = self._frames[self._write_idx] if seq else None
             distance = self.latest_distance
 
-        if frame is not None:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame_rgb)
-            img = self.add_distance_overlay(img, distance)
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.live_image_label.config(image=imgtk)
-            self.live_image_label.imgtk = imgtk
+        in_range = self.min_distance <= distance <= self.max_distance
+        new_frame = frame is not None and seq != self._last_drawn_seq
+        new_distance = distance != self._last_distance
+        self._last_drawn_seq = seq
+        self._last_distance = distance
 
-        self.update_distance_indicator(distance)
+        if in_range:
+            with self.lock:
+                if new_frame:
+                    self._infer_pending = True
+                    self._infer_event.set()
+                result = self.infer_out
+                self.infer_out = None
+                if result is not None:
+                    np.copyto(self._rgb_buf, result[1])
+            if result is not None:
+                self.show_yolo_result(result[0])
+        else:
+            with self.lock:
+                self._infer_pending = False
+                self.infer_out = None
+                self._infer_generation += 1
 
-        if self.min_distance <= distance <= self.max_distance:
-            try:
-                t_img = Image.open("t.jpg")
-                t_imgtk = ImageTk.PhotoImage(t_img)
-                self.filtered_image_label.config(image=t_imgtk)
-                self.filtered_image_label.imgtk = t_imgtk
-                self.run_yolo()
-            except Exception as e:
-                logger.error(f"Error loading or processing image: {e}")
+        if new_frame:
+            payload = b"".join((self._ppm_header, frame.data))
+            with self.lock:
+                lapped = self._frame_seq != seq
+            if not lapped:
+                self._live_photo.configure(data=payload, format="PPM")
+
+        if new_distance:
+            self.add_distance_overlay(distance)
+            self.update_distance_indicator(distance)
+            if not in_range:
+                self.show_out_of_range_image(distance)
+        
+        self.schedule_next_gui_update()
+
+    def schedule_next_gui_update(self):
+        self._next_deadline += GUI_INTERVAL
+        remaining = self._next_deadline - time.monotonic()
+        if remaining < 0:
+            self._drop_frame = True
+            self.root.after_idle(self.update_gui)
         else:
-            self.show_out_of_range_image(distance)
+            self.root.after(max(1, int(remaining * 1000)), self.update_gui)
+
+    def build_out_of_range_templates(self):
+        message = "Tespit yapılmıyor"
+        range_text = f"Geçerli aralık: {self.min_distance}-{self.max_distance} cm"
+        templates = []
+        for color in ((255, 165, 0), (100, 100, 255)):
+            template = Image.new('RGB', (640, 480), color='black')
+            draw = ImageDraw.Draw(template)
+            
+            text_bbox = draw.textbbox((0, 0), message, font=self._font24)
+            text_width = text_bbox[2] - text_bbox[0]
+            text_height = text_bbox[3] - text_bbox[1]
+            position = ((640 - text_width) // 2, (480 - text_height) // 2 - 20)
+            draw.text(position, message, fill=color, font=self._font24)
+            
+            text_bbox = draw.textbbox((0, 0), range_text, font=self._font18)
+            text_width = text_bbox[2] - text_bbox[0]
+            position = ((640 - text_width) // 2, (480 - text_height) // 2 + 60)
+            draw.text(position, range_text, fill=(200, 200, 200), font=self._font18)
+            
+            templates.append((template, color))
         
-        self.root.after(33, self.update_gui)
+        self._oor_template_near, self._oor_template_far = templates
+        self._oor_reason_y = (480 - text_height) // 2 + 20
 
     def show_out_of_range_image(self, distance):
-        placeholder = Image.new('RGB', (640, 480), color='black')
-        from PIL import ImageDraw, ImageFont
-        draw = ImageDraw.Draw(placeholder)
-        
-        try:
-            font = ImageFont.truetype("Arial", 24)
-            small_font = ImageFont.truetype("Arial", 18)
-        except IOError:
-            font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
-        
         if distance < self.min_distance:
-            message = "Tespit yapılmıyor"
+            template, color = self._oor_template_near
             reason = f"Mesafe çok yakın: {distance} cm"
-            color = (255, 165, 0)
         else: 
-            message = "Tespit yapılmıyor"
+            template, color = self._oor_template_far
             reason = f"Mesafe çok uzak: {distance} cm"
-            color = (100, 100, 255) 
-        
-        text_bbox = draw.textbbox((0, 0), message, font=font)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
-        position = ((640 - text_width) // 2, (480 - text_height) // 2 - 20)
-        draw.text(position, message, fill=color, font=font)
-        
-        text_bbox = draw.textbbox((0, 0), reason, font=small_font)
-        text_width = text_bbox[2] - text_bbox[0]
-        position = ((640 - text_width) // 2, (480 - text_height) // 2 + 20)
-        draw.text(position, reason, fill=color, font=small_font)
         
-        range_text = f"Geçerli aralık: {self.min_distance}-{self.max_distance} cm"
-        text_bbox = draw.textbbox((0, 0), range_text, font=small_font)
+        placeholder = template.copy()
+        draw = ImageDraw.Draw(placeholder)
+        text_bbox = draw.textbbox((0, 0), reason, font=self._font18)
         text_width = text_bbox[2] - text_bbox[0]
-        position = ((640 - text_width) // 2, (480 - text_height) // 2 + 60)
-        draw.text(position, range_text, fill=(200, 200, 200), font=small_font)
+        position = ((640 - text_width) // 2, self._oor_reason_y)
+        draw.text(position, reason, fill=color, font=self._font18)
         
-        placeholder_img = ImageTk.PhotoImage(placeholder)
-        self.filtered_image_label.config(image=placeholder_img)
-        self.filtered_image_label.image = placeholder_img
+        self._filt_photo.paste(placeholder)
         
+        self.warning_text = ""
+        self.stop_flashing()
         self.warning_label.config(text="")
 
-    def add_distance_overlay(self, img, distance):
-        from PIL import ImageDraw, ImageFont
-        draw = ImageDraw.Draw(img)
-        try:
-            font = ImageFont.truetype("Arial", 24)
-        except IOError:
-            font = ImageFont.load_default()
-            
-        distance_text = f"{distance} cm"
-        text_bbox = draw.textbbox((0, 0), distance_text, font=font)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
-        
-        padding = 10
-        position = (img.width - text_width - padding, padding)
-        
-        draw.rectangle(
-            [position[0] - 5, position[1] - 5, 
-             position[0] + text_width + 5, position[1] + text_height + 5], 
-            fill=(0, 0, 0, 128)
-        )
-        
+    def add_distance_overlay(self, distance):
         if distance < self.min_distance:
-            text_color = (255, 165, 0)  
+            text_color = "#FFA500"
         elif distance > self.max_distance:
-            text_color = (100, 100, 255) 
+            text_color = "#6464FF"
         else:
-            text_color = (0, 255, 0) 
+            text_color = "#00FF00"
             
-        draw.text(position, distance_text, fill=text_color, font=font)
-        return img
+        self.distance_overlay_label.config(text=f"{distance} cm", fg=text_color)
 
     def update_distance_indicator(self, distance):
         if distance < self.min_distance:
@@ -383,25 +548,70 @@ class CameraApp:
             
         self.lidar_status_label.config(text=status_text, fg=status_color)
 
-    def run_yolo(self):
-        results = self.model("t.jpg")
-        detected_objects = [results[0].names[int(box.cls)] for box in results[0].boxes]
+    def show_filtered_image(self, frame_rgb):
+        self._filt_photo.paste(Image.fromarray(frame_rgb))
+
+    def run_yolo(self, mat):
+        mat.substract_mean_normalize([], [1 / 255.0] * 3)
+        with self._ncnn.create_extractor() as ex:
+            ex.input("in0", mat)
+            _, out = ex.extract("out0")
+        pred = np.array(out)
+        
+        scores = pred[4:4 + len(self._names)]
+        class_ids = scores.argmax(axis=0)
+        confidences = scores.max(axis=0)
+        keep = confidences > YOLO_CONF_THRESHOLD
+        if not keep.any():
+            return []
+        cx, cy, w, h = pred[:4, keep]
+        class_ids = class_ids[keep]
+        confidences = confidences[keep]
+        
+        sx = 640 / YOLO_INPUT_SIZE
+        sy = 480 / YOLO_INPUT_SIZE
+        boxes = np.stack([(cx - w / 2) * sx, (cy - h / 2) * sy, w * sx, h * sy], axis=1)
+        nms_boxes = boxes.copy()
+        nms_boxes[:, :2] += class_ids[:, None] * 4096
+        indices = cv2.dnn.NMSBoxes(nms_boxes.tolist(), confidences.tolist(), YOLO_CONF_THRESHOLD, YOLO_IOU_THRESHOLD)
+        return [(self._names[int(class_ids[i])], boxes[i].astype(int).tolist()) for i in np.array(indices).flatten()]
+
+    def show_yolo_result(self, detections):
+        for name, (x, y, w, h) in detections:
+            cv2.rectangle(self._rgb_buf, (x, y), (x + w, y + h), (76, 175, 80), 2)
+            cv2.putText(self._rgb_buf, name, (x, max(y - 5, 15)), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (76, 175, 80), 2, cv2.LINE_AA)
+        self.show_filtered_image(self._rgb_buf)
+        detected_objects = [name for name, _ in detections]
         if detected_objects:
             self.warning_text = f"DİKKAT: {', '.join(detected_objects)} tespit edildi!"
-            self.flash_warning()
+            if not self._flashing:
+                self._flashing = True
+                self._flash_job = self.root.after(0, self.flash_warning)
         else:
             self.warning_text = ""
+            self.stop_flashing()
             self.warning_label.config(text="")
 
     def flash_warning(self):
-        if self.running and self.warning_text:
-            current_color = self.warning_label.cget("fg")
-            new_color = WARNING_COLOR if current_color == ALERT_COLOR else ALERT_COLOR
-            self.warning_label.config(text=self.warning_text, fg=new_color)
-            self.root.after(500, self.flash_warning)
+        self._flash_job = None
+        if not (self._flashing and self.running and self.warning_text):
+            self._flashing = False
+            return
+        current_color = self.warning_label.cget("fg")
+        new_color = WARNING_COLOR if current_color == ALERT_COLOR else ALERT_COLOR
+        self.warning_label.config(text=self.warning_text, fg=new_color)
+        self._flash_job = self.root.after(500, self.flash_warning)
+
+    def stop_flashing(self):
+        self._flashing = False
+        if self._flash_job is not None:
+            self.root.after_cancel(self._flash_job)
+            self._flash_job = None
 
     def on_closing(self):
         self.running = False
+        self.stop_flashing()
+        self._infer_event.set()
         time.sleep(0.1)
         self.camera.stop()
         self.lidar.disconnect()